@@ -2,38 +2,100 @@
 Test script to verify the package builds correctly with pyproject.toml
 """
 
-import subprocess
+import importlib.util
 import sys
 import os
+import tarfile
+import tempfile
 
-def run_command(cmd, description):
-    """Run a command and return success status."""
-    print(f"\n🔧 {description}")
-    print(f"Running: {cmd}")
+_log = []
+
+def say(message):
+    """Queue a status message to be written with the next flush."""
+    _log.append(message)
+
+def flush_log():
+    """Write all queued status messages in a single call."""
+    if _log:
+        sys.stdout.write("\n".join(_log) + "\n")
+        sys.stdout.flush()
+        _log.clear()
+
+def fail(message):
+    """Flush queued messages and report a failure immediately."""
+    flush_log()
+    print(message)
+
+def build_package(description, outdir="dist"):
+    """Build the sdist, then the wheel from that sdist, and return success status.
+
+    Returns None when a usable build module cannot be imported.
+    """
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=os.getcwd())
-        if result.returncode == 0:
-            print(f"✅ {description} successful")
-            return True
-        else:
-            print(f"❌ {description} failed")
-            print(f"STDOUT: {result.stdout}")
-            print(f"STDERR: {result.stderr}")
-            return False
+        from build import BuildBackendException, BuildException, ProjectBuilder
+        from build.env import DefaultIsolatedEnv
+    except ImportError as e:
+        say(f"⚠️ build module not available ({e}) - install with: pip install 'build>=1.0'")
+        return None
+
+    say("✅ build module available")
+
+    def build_in_isolated_env(srcdir, distribution):
+        with DefaultIsolatedEnv() as env:
+            builder = ProjectBuilder.from_isolated_env(env, srcdir)
+            env.install(builder.build_system_requires)
+            env.install(builder.get_requires_for_build(distribution))
+            return builder.build(distribution, outdir)
+
+    say(f"\n🔧 {description}")
+    flush_log()
+    try:
+        sdist = build_in_isolated_env(".", "sdist")
+        with tempfile.TemporaryDirectory() as extract_dir:
+            with tarfile.open(sdist) as archive:
+                if hasattr(tarfile, "data_filter"):
+                    archive.extractall(extract_dir, filter="data")
+                else:
+                    archive.extractall(extract_dir)
+            (sdist_root,) = os.listdir(extract_dir)
+            build_in_isolated_env(os.path.join(extract_dir, sdist_root), "wheel")
+        say(f"✅ {description} successful (wheel built from sdist)")
+        return True
+    except (BuildException, BuildBackendException) as e:
+        fail(f"❌ {description} failed: {e}")
+        return False
     except Exception as e:
-        print(f"❌ {description} failed with exception: {e}")
+        fail(f"❌ {description} failed with exception: {e}")
         return False
 
-def main():
-    """Test the package build process."""
-    print("🚀 Testing ChaCC Dependency Manager Package Build")
-    print("=" * 60)
+def existing_files(paths):
+    """Return the subset of paths that exist, listing each parent directory once."""
+    by_dir = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
 
-    if not os.path.exists("pyproject.toml"):
-        print("❌ pyproject.toml not found")
-        return False
+    found = set()
+    for directory, dir_paths in by_dir.items():
+        try:
+            with os.scandir(directory or ".") as entries:
+                present = {entry.name for entry in entries}
+        except OSError:
+            continue
+        found.update(p for p in dir_paths if os.path.basename(p) in present)
+    return found
 
-    print("✅ pyproject.toml found")
+def main():
+    """Test the package build process, flushing queued output even on error."""
+    _log.clear()
+    try:
+        return run_checks()
+    finally:
+        flush_log()
+
+def run_checks():
+    """Run the package structure, import and build checks."""
+    say("🚀 Testing ChaCC Dependency Manager Package Build")
+    say("=" * 60)
 
     package_files = [
         "src/chacc/__init__.py",
@@ -42,58 +104,61 @@ def main():
         "src/chacc/README.md",
         "LICENSE"
     ]
+    present = existing_files(["pyproject.toml"] + package_files)
+
+    if "pyproject.toml" not in present:
+        fail("❌ pyproject.toml not found")
+        return False
+
+    say("✅ pyproject.toml found")
 
     for file_path in package_files:
-        if os.path.exists(file_path):
-            print(f"✅ {file_path} exists")
+        if file_path in present:
+            say(f"✅ {file_path} exists")
         else:
-            print(f"❌ {file_path} missing")
+            fail(f"❌ {file_path} missing")
             return False
 
     try:
         sys.path.insert(0, 'src')
         from chacc import DependencyManager, __version__
-        print(f"✅ Package imports successfully (version: {__version__})")
+        say(f"✅ Package imports successfully (version: {__version__})")
     except ImportError as e:
-        print(f"❌ Package import failed: {e}")
+        fail(f"❌ Package import failed: {e}")
         return False
 
     try:
         dm = DependencyManager()
-        print("✅ DependencyManager instantiation successful")
+        say("✅ DependencyManager instantiation successful")
     except Exception as e:
-        print(f"❌ DependencyManager instantiation failed: {e}")
+        fail(f"❌ DependencyManager instantiation failed: {e}")
         return False
 
-    try:
-        import build
-        print("✅ build module available")
-        if run_command("python -m build --help", "Check build command availability"):
-            if run_command("python -m build", "Build package"):
-                print("✅ Package builds successfully")
-                if os.path.exists("dist"):
-                    dist_files = os.listdir("dist")
-                    print(f"✅ Distribution files created: {dist_files}")
-                else:
-                    print("❌ dist directory not created")
-                    return False
+    if importlib.util.find_spec("build") is not None:
+        built = build_package("Build package")
+        if built:
+            say("✅ Package builds successfully")
+            if os.path.exists("dist"):
+                dist_files = os.listdir("dist")
+                say(f"✅ Distribution files created: {dist_files}")
             else:
-                print("⚠️ Build command failed (build tools may not be installed)")
-        else:
-            print("⚠️ Build tools not available for testing")
-    except ImportError:
-        print("⚠️ build module not available - install with: pip install build")
-
-    print("\n" + "=" * 60)
-    print("🎉 Package structure and basic functionality verified!")
-    print("\n📦 Ready for publishing with:")
-    print("   python -m build")
-    print("   python -m twine upload dist/*")
-    print("\n📋 Pre-publishing checklist:")
-    print("   - Update version in pyproject.toml")
-    print("   - Test on Test PyPI first")
-    print("   - Create GitHub release")
-    print("   - Update documentation")
+                fail("❌ dist directory not created")
+                return False
+        elif built is not None:
+            say("⚠️ Build failed (build tools may not be installed)")
+    else:
+        say("⚠️ build module not available - install with: pip install build")
+
+    say("\n" + "=" * 60)
+    say("🎉 Package structure and basic functionality verified!")
+    say("\n📦 Ready for publishing with:")
+    say("   python -m build")
+    say("   python -m twine upload dist/*")
+    say("\n📋 Pre-publishing checklist:")
+    say("   - Update version in pyproject.toml")
+    say("   - Test on Test PyPI first")
+    say("   - Create GitHub release")
+    say("   - Update documentation")
 
     return True
 
@@ -5,19 +5,20 @@ Test script to demonstrate enhanced API with full parameter support.
 import sys
 import logging
 import asyncio
+import functools
 import pytest
-sys.path.insert(0, 'src')
-
-from chacc import (
-    Config,
-    re_resolve_dependencies,
-    resolve_module_dependencies,
-    invalidate_dependency_cache
-)
 
 @pytest.mark.asyncio
 async def test_enhanced_api():
     """Test the enhanced API with custom parameters."""
+    sys.path.insert(0, 'src')
+    from chacc import (
+        Config,
+        re_resolve_dependencies,
+        resolve_module_dependencies,
+        invalidate_dependency_cache
+    )
+
     print("=== Testing Enhanced API ===")
 
     custom_logger = logging.getLogger('custom_test')
@@ -28,25 +29,36 @@ async def test_enhanced_api():
 
     config = Config(cache_dir='./test_cache', logger=custom_logger)
 
-    print("\n1. Testing re_resolve_dependencies with custom config:")
-    try:
-        await re_resolve_dependencies(
+    print("\n1-2. Testing re_resolve_dependencies and resolve_module_dependencies concurrently:")
+    loop = asyncio.get_running_loop()
+    re_resolve_result, resolve_result = await asyncio.gather(
+        re_resolve_dependencies(
             modules_requirements={'test': 'requests>=2.25.0\npackaging>=20.0'},
             config=config
-        )
-    except Exception as e:
-        print(f"Expected error (piptools not available): {e}")
-
-    print("\n2. Testing resolve_module_dependencies with custom config:")
-    try:
-        packages = resolve_module_dependencies(
-            'mymodule',
-            'requests>=2.25.0',
-            config=config
-        )
-        print(f"Resolved packages: {packages}")
-    except Exception as e:
-        print(f"Expected error (piptools not available): {e}")
+        ),
+        loop.run_in_executor(
+            None,
+            functools.partial(
+                resolve_module_dependencies,
+                'mymodule',
+                'requests>=2.25.0',
+                config=config
+            )
+        ),
+        return_exceptions=True
+    )
+
+    for result in (re_resolve_result, resolve_result):
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+
+    if isinstance(re_resolve_result, Exception):
+        print(f"Expected error (piptools not available): {re_resolve_result}")
+
+    if isinstance(resolve_result, Exception):
+        print(f"Expected error (piptools not available): {resolve_result}")
+    else:
+        print(f"Resolved packages: {resolve_result}")
 
     print("\n3. Testing invalidate_dependency_cache with custom config:")
     invalidate_dependency_cache(config=config)